@@ -5,146 +5,163 @@ Allows editing PDF text extract, running import preview and import,
 then displaying full account and transaction information from backend.
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 from io import BytesIO
-import tempfile
 
 # Configuration
 BASE_URL = os.getenv("BACKEND_URL", "http://localhost:8080")
 API_BASE = f"{BASE_URL}/api"
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+def response_json(response) -> Any:
+    """Decode a JSON response body with orjson."""
+    return orjson.loads(response.content)
+
+
+def write_lines(lines: list):
+    """Write a block of output lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def format_transaction(index: int, tx: Dict[str, Any]) -> str:
+    """Format one transaction as a block of lines for print_transactions."""
+    block = (
+        f"\n  Transaction {index}:\n"
+        f"    Transaction ID: {tx.get('transactionId', 'N/A')}\n"
+        f"    Account ID: {tx.get('accountId', 'N/A')}\n"
+        f"    Date: {tx.get('transactionDate', 'N/A')}\n"
+        f"    Description: {tx.get('description', 'N/A')}\n"
+        f"    Amount: {tx.get('amount', 'N/A')}\n"
+        f"    Category: {tx.get('categoryPrimary', 'N/A')}\n"
+        f"    Merchant: {tx.get('merchantName', 'N/A')}"
+    )
+    plaid_id = tx.get('plaidTransactionId')
+    if plaid_id:
+        block += f"\n    Plaid ID: {plaid_id}"
+    return block
+
 
 class PDFImportTester:
     def __init__(self, auth_token: str):
         self.auth_token = auth_token
-        self.headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json"
-        }
-        self.multipart_headers = {
+        self.auth_headers = {
             "Authorization": f"Bearer {auth_token}"
         }
-    
-    def create_pdf_from_text(self, text: str, filename: str = "test.pdf") -> BytesIO:
-        """Create a simple text file that simulates PDF content.
         
-        Note: In a real scenario, you'd need to create an actual PDF file.
-        For testing purposes, we'll create a text file with .pdf extension.
-        The backend PDF parser should be able to extract text from it.
-        """
-        # Create a simple text file with PDF-like content
-        # In production, use a PDF library like PyPDF2 or reportlab
-        return BytesIO(text.encode('utf-8'))
+        # One pooled HTTP/2-capable client shared by all calls; HTTP/2 multiplexes
+        # requests over a single connection when the backend negotiates it over TLS
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(http2=True, limits=HTTP_LIMITS, retries=3),
+            **self._client_options()
+        )
+        
+        # Successful get_account responses, keyed by account ID
+        self._account_cache: Dict[str, Dict[str, Any]] = {}
+    
+    def _client_options(self) -> Dict[str, Any]:
+        """Options shared by the sync client and the per-run async clients."""
+        return {
+            "base_url": API_BASE,
+            "headers": self.auth_headers,
+            "timeout": httpx.Timeout(30.0, connect=5.0),
+        }
+    
+    def close(self):
+        """Close the underlying HTTP client."""
+        self.client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
-    def preview_pdf_import(self, pdf_text: str, filename: str = "test.pdf") -> Dict[str, Any]:
-        """Run PDF import preview."""
+    def _post_pdf(self, path: str, pdf_bytes: bytes, filename: str, params: Dict[str, Any]):
+        """Upload PDF content as a multipart body, which httpx streams from the file object in chunks."""
+        # For testing, the "PDF" is the text extract sent with a .pdf name; the
+        # backend parser extracts text from it. Use a real PDF library in production.
+        files = {
+            'file': (filename, BytesIO(pdf_bytes), 'application/pdf')
+        }
+        return self.client.post(path, files=files, params=params)
+    
+    def preview_pdf_import(self, pdf_bytes: bytes, filename: str = "test.pdf") -> Dict[str, Any]:
+        """Run PDF import preview on the encoded PDF content."""
         print(f"\n{'='*60}")
         print("Running PDF Import Preview...")
         print(f"{'='*60}\n")
         
-        # Create a temporary file with the PDF text
-        # Note: For a real PDF, you'd need to create an actual PDF file
-        # For testing, we'll create a text file that the backend can parse
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(pdf_text)
-            temp_filename = f.name
-        
-        try:
-            # Read the file as binary for multipart upload
-            with open(temp_filename, 'rb') as f:
-                files = {
-                    'file': (filename, f, 'application/pdf')
-                }
-                
-                response = requests.post(
-                    f"{API_BASE}/import-pdf/preview",
-                    headers=self.multipart_headers,
-                    files=files,
-                    params={"filename": filename}
-                )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Preview failed: {response.status_code}")
-                print(f"Response: {response.text}")
-                return {"error": response.text, "status_code": response.status_code}
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
+        response = self._post_pdf("/import-pdf/preview", pdf_bytes, filename, {"filename": filename})
+        
+        if response.status_code == 200:
+            return response_json(response)
+        else:
+            print(f"❌ Preview failed: {response.status_code}")
+            print(f"Response: {response.text}")
+            return {"error": response.text, "status_code": response.status_code}
     
-    def import_pdf(self, pdf_text: str, account_id: Optional[str] = None, 
+    def import_pdf(self, pdf_bytes: bytes, account_id: Optional[str] = None, 
                    filename: str = "test.pdf", password: Optional[str] = None) -> Dict[str, Any]:
-        """Run PDF import."""
+        """Run PDF import on the encoded PDF content."""
         print(f"\n{'='*60}")
         print("Running PDF Import...")
         print(f"{'='*60}\n")
         
-        # Create a temporary file with the PDF text
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(pdf_text)
-            temp_filename = f.name
-        
-        try:
-            # Read the file as binary for multipart upload
-            with open(temp_filename, 'rb') as f:
-                files = {
-                    'file': (filename, f, 'application/pdf')
-                }
-                
-                params = {}
-                if account_id:
-                    params['accountId'] = account_id
-                if password:
-                    params['password'] = password
-                if filename:
-                    params['filename'] = filename
-                
-                response = requests.post(
-                    f"{API_BASE}/import-pdf",
-                    headers=self.multipart_headers,
-                    files=files,
-                    params=params
-                )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"❌ Import failed: {response.status_code}")
-                print(f"Response: {response.text}")
-                return {"error": response.text, "status_code": response.status_code}
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_filename):
-                os.unlink(temp_filename)
+        params = {}
+        if account_id:
+            params['accountId'] = account_id
+        if password:
+            params['password'] = password
+        if filename:
+            params['filename'] = filename
+        
+        response = self._post_pdf("/import-pdf", pdf_bytes, filename, params)
+        
+        if response.status_code == 200:
+            result = response_json(response)
+            # The import updates the target account, so drop any cached copy
+            if account_id:
+                self.invalidate_account(account_id)
+            if result.get('createdAccountId'):
+                self.invalidate_account(result['createdAccountId'])
+            return result
+        else:
+            print(f"❌ Import failed: {response.status_code}")
+            print(f"Response: {response.text}")
+            return {"error": response.text, "status_code": response.status_code}
     
     def get_account(self, account_id: str) -> Dict[str, Any]:
-        """Get account details."""
-        response = requests.get(
-            f"{API_BASE}/accounts/{account_id}",
-            headers=self.headers
-        )
+        """Get account details, reusing a cached response when available."""
+        if account_id in self._account_cache:
+            return self._account_cache[account_id]
+        
+        response = self.client.get(f"/accounts/{account_id}")
         
         if response.status_code == 200:
-            return response.json()
+            account = response_json(response)
+            self._account_cache[account_id] = account
+            return account
         else:
             print(f"❌ Failed to get account: {response.status_code}")
             print(f"Response: {response.text}")
             return {"error": response.text, "status_code": response.status_code}
     
+    def invalidate_account(self, account_id: str):
+        """Forget the cached details for an account so the next lookup refetches it."""
+        self._account_cache.pop(account_id, None)
+    
     def get_all_accounts(self) -> list:
         """Get all accounts for the user."""
-        response = requests.get(
-            f"{API_BASE}/accounts",
-            headers=self.headers
-        )
+        response = self.client.get("/accounts")
         
         if response.status_code == 200:
-            return response.json()
+            return response_json(response)
         else:
             print(f"❌ Failed to get accounts: {response.status_code}")
             print(f"Response: {response.text}")
@@ -152,176 +169,222 @@ class PDFImportTester:
     
     def get_transactions(self, account_id: Optional[str] = None, limit: int = 100) -> list:
         """Get transactions for an account or all transactions."""
-        url = f"{API_BASE}/transactions"
         params = {"limit": limit}
         
         if account_id:
             params["accountId"] = account_id
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.client.get("/transactions", params=params)
         
         if response.status_code == 200:
-            return response.json()
+            return response_json(response)
         else:
             print(f"❌ Failed to get transactions: {response.status_code}")
             print(f"Response: {response.text}")
             return []
     
+    async def get_transactions_all_async(self, account_id: Optional[str] = None, page_size: int = 100,
+                                         max_pages: int = 20, concurrency: int = 4) -> list:
+        """Get every transaction page, requesting `concurrency` pages at a time.
+        
+        The transactions endpoint pages by page/size and returns no total, so pages
+        are fetched speculatively in waves until one comes back short. Like
+        get_transactions, any failed page yields []. If max_pages pages are all
+        full, a warning is printed and only those pages are returned.
+        """
+        transactions = []
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=3)
+        async with httpx.AsyncClient(transport=transport, **self._client_options()) as client:
+            for first_page in range(0, max_pages, concurrency):
+                pages = range(first_page, min(first_page + concurrency, max_pages))
+                responses = await asyncio.gather(*[
+                    client.get("/transactions", params={"page": page, "size": page_size})
+                    for page in pages
+                ])
+                
+                for response in responses:
+                    if response.status_code != 200:
+                        print(f"❌ Failed to get transactions: {response.status_code}")
+                        print(f"Response: {response.text}")
+                        return []
+                    
+                    batch = response_json(response)
+                    transactions.extend(batch)
+                    if len(batch) < page_size:
+                        return self._filter_by_account(transactions, account_id)
+        
+        print(f"⚠️ Stopped after {max_pages} pages of {page_size}; more transactions may exist "
+              f"(raise max_pages to fetch them)")
+        return self._filter_by_account(transactions, account_id)
+    
+    def get_transactions_all(self, account_id: Optional[str] = None, page_size: int = 100,
+                             max_pages: int = 20, concurrency: int = 4) -> list:
+        """Synchronous wrapper around get_transactions_all_async."""
+        return asyncio.run(self.get_transactions_all_async(account_id, page_size, max_pages, concurrency))
+    
+    @staticmethod
+    def _filter_by_account(transactions: list, account_id: Optional[str]) -> list:
+        """Keep only an account's transactions; the list endpoint is not account-scoped."""
+        if not account_id:
+            return transactions
+        return [tx for tx in transactions if tx.get('accountId') == account_id]
+    
     def print_preview_results(self, preview_data: Dict[str, Any]):
         """Print preview results in a readable format."""
-        print("\n" + "="*60)
-        print("PREVIEW RESULTS")
-        print("="*60)
+        lines = ["\n" + "="*60, "PREVIEW RESULTS", "="*60]
         
         if "error" in preview_data:
-            print(f"❌ Error: {preview_data.get('error')}")
+            lines.append(f"❌ Error: {preview_data.get('error')}")
+            write_lines(lines)
             return
         
         # Print detected account info
         if "detectedAccount" in preview_data:
             account = preview_data["detectedAccount"]
-            print("\n📋 Detected Account:")
-            print(f"  Account Name: {account.get('accountName', 'N/A')}")
-            print(f"  Institution: {account.get('institutionName', 'N/A')}")
-            print(f"  Account Type: {account.get('accountType', 'N/A')}")
-            print(f"  Account Subtype: {account.get('accountSubtype', 'N/A')}")
-            print(f"  Account Number: {account.get('accountNumber', 'N/A')}")
-            print(f"  Balance: {account.get('balance', 'N/A')}")
+            lines.append("\n📋 Detected Account:")
+            lines.append(f"  Account Name: {account.get('accountName', 'N/A')}")
+            lines.append(f"  Institution: {account.get('institutionName', 'N/A')}")
+            lines.append(f"  Account Type: {account.get('accountType', 'N/A')}")
+            lines.append(f"  Account Subtype: {account.get('accountSubtype', 'N/A')}")
+            lines.append(f"  Account Number: {account.get('accountNumber', 'N/A')}")
+            lines.append(f"  Balance: {account.get('balance', 'N/A')}")
         
         # Print matched account info
         if "matchedAccountId" in preview_data:
-            print(f"\n🔗 Matched Account ID: {preview_data.get('matchedAccountId', 'N/A')}")
+            lines.append(f"\n🔗 Matched Account ID: {preview_data.get('matchedAccountId', 'N/A')}")
         
         # Print credit card metadata
         if "paymentDueDate" in preview_data or "minimumPaymentDue" in preview_data or "rewardPoints" in preview_data:
-            print(f"\n💳 Credit Card Metadata:")
-            print(f"  Payment Due Date: {preview_data.get('paymentDueDate', 'N/A')}")
-            print(f"  Minimum Payment Due: {preview_data.get('minimumPaymentDue', 'N/A')}")
-            print(f"  Reward Points: {preview_data.get('rewardPoints', 'N/A')}")
+            lines.append(f"\n💳 Credit Card Metadata:")
+            lines.append(f"  Payment Due Date: {preview_data.get('paymentDueDate', 'N/A')}")
+            lines.append(f"  Minimum Payment Due: {preview_data.get('minimumPaymentDue', 'N/A')}")
+            lines.append(f"  Reward Points: {preview_data.get('rewardPoints', 'N/A')}")
         
         # Print transactions
         transactions = preview_data.get("transactions", [])
         if transactions:
-            print(f"\n📊 Transactions Preview ({len(transactions)} found):")
+            lines.append(f"\n📊 Transactions Preview ({len(transactions)} found):")
             for i, tx in enumerate(transactions[:10], 1):  # Show first 10
-                print(f"\n  Transaction {i}:")
-                print(f"    Date: {tx.get('date', tx.get('transactionDate', 'N/A'))}")
-                print(f"    Description: {tx.get('description', 'N/A')}")
-                print(f"    Amount: {tx.get('amount', 'N/A')}")
-                print(f"    Category: {tx.get('category', tx.get('categoryPrimary', 'N/A'))}")
+                lines.append(f"\n  Transaction {i}:")
+                lines.append(f"    Date: {tx.get('date', tx.get('transactionDate', 'N/A'))}")
+                lines.append(f"    Description: {tx.get('description', 'N/A')}")
+                lines.append(f"    Amount: {tx.get('amount', 'N/A')}")
+                lines.append(f"    Category: {tx.get('category', tx.get('categoryPrimary', 'N/A'))}")
                 if tx.get('duplicates'):
-                    print(f"    ⚠️  Duplicates: {len(tx.get('duplicates', []))} potential duplicate(s)")
+                    lines.append(f"    ⚠️  Duplicates: {len(tx.get('duplicates', []))} potential duplicate(s)")
             if len(transactions) > 10:
-                print(f"\n  ... and {len(transactions) - 10} more transactions")
+                lines.append(f"\n  ... and {len(transactions) - 10} more transactions")
         
         # Print pagination info
         if "totalPages" in preview_data:
-            print(f"\n📄 Pagination: Page {preview_data.get('currentPage', 0) + 1} of {preview_data.get('totalPages', 1)}")
-            print(f"   Total Transactions: {preview_data.get('totalTransactions', len(transactions))}")
+            lines.append(f"\n📄 Pagination: Page {preview_data.get('currentPage', 0) + 1} of {preview_data.get('totalPages', 1)}")
+            lines.append(f"   Total Transactions: {preview_data.get('totalTransactions', len(transactions))}")
+        
+        write_lines(lines)
     
     def print_import_results(self, import_data: Dict[str, Any]):
         """Print import results in a readable format."""
-        print("\n" + "="*60)
-        print("IMPORT RESULTS")
-        print("="*60)
+        lines = ["\n" + "="*60, "IMPORT RESULTS", "="*60]
         
         if "error" in import_data:
-            print(f"❌ Error: {import_data.get('error')}")
+            lines.append(f"❌ Error: {import_data.get('error')}")
+            write_lines(lines)
             return
         
-        print(f"\n✅ Import Status:")
-        print(f"  Created: {import_data.get('created', 0)}")
-        print(f"  Failed: {import_data.get('failed', 0)}")
-        print(f"  Successful: {import_data.get('successful', 0)}")
+        lines.append(f"\n✅ Import Status:")
+        lines.append(f"  Created: {import_data.get('created', 0)}")
+        lines.append(f"  Failed: {import_data.get('failed', 0)}")
+        lines.append(f"  Successful: {import_data.get('successful', 0)}")
         
         if "createdAccountId" in import_data:
-            print(f"\n📋 Created/Matched Account ID: {import_data['createdAccountId']}")
+            lines.append(f"\n📋 Created/Matched Account ID: {import_data['createdAccountId']}")
         
         if "errors" in import_data and import_data["errors"]:
-            print(f"\n⚠️ Errors:")
+            lines.append(f"\n⚠️ Errors:")
             for error in import_data["errors"]:
-                print(f"  - {error}")
+                lines.append(f"  - {error}")
+        
+        write_lines(lines)
     
     def print_account_details(self, account: Dict[str, Any]):
         """Print account details in a readable format."""
-        print("\n" + "="*60)
-        print("ACCOUNT DETAILS")
-        print("="*60)
+        lines = ["\n" + "="*60, "ACCOUNT DETAILS", "="*60]
         
         if "error" in account:
-            print(f"❌ Error: {account.get('error')}")
+            lines.append(f"❌ Error: {account.get('error')}")
+            write_lines(lines)
             return
         
-        print(f"\n📋 Account Information:")
-        print(f"  Account ID: {account.get('accountId', 'N/A')}")
-        print(f"  Account Name: {account.get('accountName', 'N/A')}")
-        print(f"  Institution: {account.get('institutionName', 'N/A')}")
-        print(f"  Account Type: {account.get('accountType', 'N/A')}")
-        print(f"  Account Subtype: {account.get('accountSubtype', 'N/A')}")
-        print(f"  Balance: {account.get('balance', 'N/A')}")
-        print(f"  Currency: {account.get('currencyCode', 'N/A')}")
-        print(f"  Account Number: {account.get('accountNumber', 'N/A')}")
-        print(f"  Active: {account.get('active', 'N/A')}")
-        print(f"  Last Synced: {account.get('lastSyncedAt', 'N/A')}")
+        lines.append(f"\n📋 Account Information:")
+        lines.append(f"  Account ID: {account.get('accountId', 'N/A')}")
+        lines.append(f"  Account Name: {account.get('accountName', 'N/A')}")
+        lines.append(f"  Institution: {account.get('institutionName', 'N/A')}")
+        lines.append(f"  Account Type: {account.get('accountType', 'N/A')}")
+        lines.append(f"  Account Subtype: {account.get('accountSubtype', 'N/A')}")
+        lines.append(f"  Balance: {account.get('balance', 'N/A')}")
+        lines.append(f"  Currency: {account.get('currencyCode', 'N/A')}")
+        lines.append(f"  Account Number: {account.get('accountNumber', 'N/A')}")
+        lines.append(f"  Active: {account.get('active', 'N/A')}")
+        lines.append(f"  Last Synced: {account.get('lastSyncedAt', 'N/A')}")
         
         # Credit card metadata
         if account.get('paymentDueDate') or account.get('minimumPaymentDue') or account.get('rewardPoints'):
-            print(f"\n💳 Credit Card Metadata:")
-            print(f"  Payment Due Date: {account.get('paymentDueDate', 'N/A')}")
-            print(f"  Minimum Payment Due: {account.get('minimumPaymentDue', 'N/A')}")
-            print(f"  Reward Points: {account.get('rewardPoints', 'N/A')}")
+            lines.append(f"\n💳 Credit Card Metadata:")
+            lines.append(f"  Payment Due Date: {account.get('paymentDueDate', 'N/A')}")
+            lines.append(f"  Minimum Payment Due: {account.get('minimumPaymentDue', 'N/A')}")
+            lines.append(f"  Reward Points: {account.get('rewardPoints', 'N/A')}")
+        
+        write_lines(lines)
     
     def print_transactions(self, transactions: list, limit: int = 20):
         """Print transactions in a readable format."""
-        print("\n" + "="*60)
-        print(f"TRANSACTIONS (showing {min(limit, len(transactions))} of {len(transactions)})")
-        print("="*60)
+        lines = [
+            "\n" + "="*60,
+            f"TRANSACTIONS (showing {min(limit, len(transactions))} of {len(transactions)})",
+            "="*60
+        ]
         
         if not transactions:
-            print("No transactions found.")
+            lines.append("No transactions found.")
+            write_lines(lines)
             return
         
-        for i, tx in enumerate(transactions[:limit], 1):
-            print(f"\n  Transaction {i}:")
-            print(f"    Transaction ID: {tx.get('transactionId', 'N/A')}")
-            print(f"    Account ID: {tx.get('accountId', 'N/A')}")
-            print(f"    Date: {tx.get('transactionDate', 'N/A')}")
-            print(f"    Description: {tx.get('description', 'N/A')}")
-            print(f"    Amount: {tx.get('amount', 'N/A')}")
-            print(f"    Category: {tx.get('categoryPrimary', 'N/A')}")
-            print(f"    Merchant: {tx.get('merchantName', 'N/A')}")
-            if tx.get('plaidTransactionId'):
-                print(f"    Plaid ID: {tx.get('plaidTransactionId')}")
+        lines.extend(format_transaction(i, tx) for i, tx in enumerate(transactions[:limit], 1))
+        write_lines(lines)
     
     def run_full_test(self, pdf_text: str, account_id: Optional[str] = None):
         """Run full test: preview, import, and fetch results."""
+        # Encode once; preview and import upload the same bytes
+        pdf_bytes = pdf_text.encode('utf-8')
+        
         # Step 1: Preview
-        preview_result = self.preview_pdf_import(pdf_text)
+        preview_result = self.preview_pdf_import(pdf_bytes)
         self.print_preview_results(preview_result)
         
         # Ask user if they want to proceed with import
         print("\n" + "="*60)
-        response = input("Do you want to proceed with the import? (y/n): ").strip().lower()
+        response = prompt("Do you want to proceed with the import? (y/n): ", default="n").lower()
         if response != 'y':
             print("Import cancelled.")
             return
         
         # Step 2: Import
-        import_result = self.import_pdf(pdf_text, account_id=account_id)
+        import_result = self.import_pdf(pdf_bytes, account_id=account_id)
         self.print_import_results(import_result)
         
         # Step 3: Get account details if account was created/matched
         created_account_id = import_result.get('createdAccountId')
         if created_account_id:
+            # Step 4: Account and transaction lookups are independent, so fetch both at once
             print(f"\n{'='*60}")
-            print("Fetching account details...")
-            account = self.get_account(created_account_id)
-            self.print_account_details(account)
+            print("Fetching account details and transactions...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                account_future = executor.submit(self.get_account, created_account_id)
+                transactions_future = executor.submit(self.get_transactions, created_account_id, 50)
+                account = account_future.result()
+                transactions = transactions_future.result()
             
-            # Step 4: Get transactions for this account
-            print(f"\n{'='*60}")
-            print("Fetching transactions...")
-            transactions = self.get_transactions(account_id=created_account_id, limit=50)
+            self.print_account_details(account)
             self.print_transactions(transactions, limit=50)
         else:
             print("\n⚠️ No account ID returned from import. Listing all accounts...")
@@ -338,8 +401,25 @@ class PDFImportTester:
             self.print_transactions(transactions, limit=50)
 
 
+def prompt(message: str, default: str = "") -> str:
+    """Ask the user for input, or return the default when stdin is not a terminal."""
+    if not sys.stdin.isatty():
+        return default
+    return input(message).strip()
+
+
 def edit_text_interactive(default_text: str = "") -> str:
-    """Allow user to edit text interactively."""
+    """Allow user to edit text interactively, or read it all from piped stdin."""
+    if not sys.stdin.isatty():
+        # Piped input (e.g. `cat statement.txt | ...`): read it in one go up to an END line,
+        # splitting on any line ending so CRLF files match the interactive loop below
+        lines = []
+        for line in sys.stdin.read().splitlines():
+            if line.strip() == 'END':
+                break
+            lines.append(line)
+        return '\n'.join(lines)
+    
     print("\n" + "="*60)
     print("PDF TEXT EDITOR")
     print("="*60)
@@ -349,7 +429,7 @@ def edit_text_interactive(default_text: str = "") -> str:
     
     if default_text:
         print(f"\nDefault text (you can edit this):\n{default_text}\n")
-        use_default = input("Use default text? (y/n): ").strip().lower()
+        use_default = prompt("Use default text? (y/n): ").lower()
         if use_default == 'y':
             return default_text
     
@@ -375,7 +455,7 @@ def main():
     # Get auth token
     auth_token = os.getenv("AUTH_TOKEN")
     if not auth_token:
-        auth_token = input("\nEnter your authentication token: ").strip()
+        auth_token = prompt("\nEnter your authentication token: ")
         if not auth_token:
             print("❌ Authentication token is required.")
             sys.exit(1)
@@ -384,9 +464,6 @@ def main():
     backend_url = os.getenv("BACKEND_URL", "http://localhost:8080")
     print(f"\nUsing backend URL: {backend_url}")
     
-    # Initialize tester
-    tester = PDFImportTester(auth_token)
-    
     # Sample PDF text (for testing)
     sample_text = """Credit Card Statement
 Account Number: ****1234
@@ -413,12 +490,13 @@ Date Description Amount
         sys.exit(1)
     
     # Optional: Get account ID
-    account_id = input("\nEnter account ID (optional, press Enter to skip): ").strip()
+    account_id = prompt("\nEnter account ID (optional, press Enter to skip): ")
     if not account_id:
         account_id = None
     
-    # Run full test
-    tester.run_full_test(pdf_text, account_id=account_id)
+    # Initialize tester and run full test
+    with PDFImportTester(auth_token) as tester:
+        tester.run_full_test(pdf_text, account_id=account_id)
     
     print("\n" + "="*60)
     print("Test completed!")
@@ -4,77 +4,190 @@ Database Review Script for BudgetBuddy Backend
 Reviews all DynamoDB tables, identifies duplicates, and provides statistics
 
 Usage:
-    python3 review-database.py [--region us-east-1] [--table-prefix BudgetBuddy]
+    python3 review-database.py [--region us-east-1] [--table-prefix BudgetBuddy] [--scan-segments 4] [--quiet]
 """
 
 import boto3
-import json
+from botocore.config import Config
+import orjson
 import sys
 import argparse
-from collections import defaultdict
+import mmap
+import os
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
+
+# Colors for terminal output; left empty when stdout is piped so logs carry no escape codes
+USE_COLOR = sys.stdout.isatty()
 
-# Colors for terminal output
 class Colors:
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    BLUE = '\033[0;34m'
-    NC = '\033[0m'  # No Color
+    RED = '\033[0;31m' if USE_COLOR else ''
+    GREEN = '\033[0;32m' if USE_COLOR else ''
+    YELLOW = '\033[1;33m' if USE_COLOR else ''
+    BLUE = '\033[0;34m' if USE_COLOR else ''
+    NC = '\033[0m' if USE_COLOR else ''  # No Color
+
+# Message decorations, built once at import time
+SUCCESS_PREFIX = f"{Colors.GREEN}✓{Colors.NC} "
+WARNING_PREFIX = f"{Colors.YELLOW}⚠{Colors.NC}  "
+ERROR_PREFIX = f"{Colors.RED}✗{Colors.NC} "
+HEADER_TOP = f"\n{Colors.BLUE}{'=' * 60}{Colors.NC}\n{Colors.BLUE}"
+HEADER_BOTTOM = f"{Colors.NC}\n{Colors.BLUE}{'=' * 60}{Colors.NC}\n\n"
+
+# Attributes (and their DynamoDB types) read by the analyze_* and print_*_analysis functions
+ACCOUNT_FIELDS = [('accountId', 'S'), ('plaidAccountId', 'S'), ('userId', 'S'), ('active', 'BOOL'), ('accountName', 'S')]
+TRANSACTION_FIELDS = [('transactionId', 'S'), ('plaidTransactionId', 'S'), ('userId', 'S'), ('accountId', 'S')]
+ACCOUNT_ATTRIBUTES = [name for name, _ in ACCOUNT_FIELDS]
+TRANSACTION_ATTRIBUTES = [name for name, _ in TRANSACTION_FIELDS]
+
+# Items tallied per Counter.update call in analyze_transactions
+ANALYSIS_BATCH_SIZE = 1000
+
+# Output formatting for the analysis JSON files
+ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Below this size a plain write is cheaper than setting up a memory map
+MMAP_WRITE_THRESHOLD = 64 * 1024
 
 def print_header(text: str):
-    print(f"\n{Colors.BLUE}{'=' * 60}{Colors.NC}")
-    print(f"{Colors.BLUE}{text}{Colors.NC}")
-    print(f"{Colors.BLUE}{'=' * 60}{Colors.NC}\n")
+    sys.stdout.write(HEADER_TOP + text + HEADER_BOTTOM)
 
 def print_success(text: str):
-    print(f"{Colors.GREEN}✓{Colors.NC} {text}")
+    sys.stdout.write(SUCCESS_PREFIX + text + '\n')
 
 def print_warning(text: str):
-    print(f"{Colors.YELLOW}⚠{Colors.NC}  {text}")
+    sys.stdout.write(WARNING_PREFIX + text + '\n')
 
 def print_error(text: str):
-    print(f"{Colors.RED}✗{Colors.NC} {text}")
+    sys.stdout.write(ERROR_PREFIX + text + '\n')
 
-def scan_table(dynamodb_client, table_name: str) -> List[Dict[str, Any]]:
-    """Scan a DynamoDB table and return all items"""
-    items = []
-    last_evaluated_key = None
-    
-    print(f"Scanning {table_name}...", end=" ", flush=True)
-    
-    while True:
-        if last_evaluated_key:
-            response = dynamodb_client.scan(
-                TableName=table_name,
-                ExclusiveStartKey=last_evaluated_key
-            )
+def list_table_names(dynamodb_client) -> Set[str]:
+    """Return the names of all DynamoDB tables in the region"""
+    table_names = set()
+    for page in dynamodb_client.get_paginator('list_tables').paginate():
+        table_names.update(page.get('TableNames', []))
+    return table_names
+
+def describe_table(dynamodb_client, table_name: str) -> Optional[Dict[str, Any]]:
+    """Describe a DynamoDB table, returning None if it does not exist"""
+    try:
+        return dynamodb_client.describe_table(TableName=table_name)['Table']
+    except dynamodb_client.exceptions.ResourceNotFoundException:
+        return None
+
+def iter_table(dynamodb_client, table_name: str, total_segments: int = 4,
+               attributes: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the items of a DynamoDB table as parallel segment scans return pages
+    
+    If attributes is given, only those attributes are fetched for each item.
+    """
+    base_kwargs = {'TableName': table_name, 'TotalSegments': total_segments}
+    if attributes:
+        # Alias every attribute so names never collide with DynamoDB reserved words
+        names = {f"#a{i}": attr for i, attr in enumerate(attributes)}
+        base_kwargs['ProjectionExpression'] = ", ".join(names)
+        base_kwargs['ExpressionAttributeNames'] = names
+    
+    # Segment workers hand pages over a bounded queue, so scanning pauses when the
+    # consumer falls behind; None marks a finished segment
+    pages = queue.Queue(maxsize=2 * total_segments)
+    stop = threading.Event()
+    
+    def hand_over(value) -> bool:
+        """Queue value for the consumer, giving up once it has stopped reading"""
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def scan_segment(segment: int):
+        kwargs = dict(base_kwargs, Segment=segment)
+        try:
+            while not stop.is_set():
+                response = dynamodb_client.scan(**kwargs)
+                if not hand_over(response.get('Items', [])):
+                    return
+                
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if not last_evaluated_key:
+                    break
+                kwargs['ExclusiveStartKey'] = last_evaluated_key
+        except Exception as e:
+            hand_over(e)
         else:
-            response = dynamodb_client.scan(TableName=table_name)
-        
-        items.extend(response.get('Items', []))
+            hand_over(None)
+    
+    count = 0
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
         
-        last_evaluated_key = response.get('LastEvaluatedKey')
-        if not last_evaluated_key:
-            break
+        try:
+            remaining = total_segments
+            while remaining:
+                page = pages.get()
+                if page is None:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    count += len(page)
+                    yield from page
+        finally:
+            # Let the other segments wind down if the consumer stops early
+            stop.set()
+    
+    # Scans may run concurrently, so report on a single line once finished
+    print(f"Scanning {table_name}... Found {count} items")
+
+def compact_item(item: Dict[str, Any], fields: List[Tuple[str, str]]) -> Tuple:
+    """Reduce an item to a tuple of its plain field values"""
+    return tuple([item.get(name, {}).get(type_name) for name, type_name in fields])
+
+def expand_item(record: Tuple, fields: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Rebuild a DynamoDB-typed item from a compact_item tuple"""
+    return {
+        name: {type_name: value}
+        for (name, type_name), value in zip(fields, record)
+        if value is not None
+    }
+
+def track_duplicate(key: str, item: Dict[str, Any], record: Tuple, first_seen: Dict[str, Tuple],
+                    duplicates: Dict[str, List[Dict[str, Any]]], fields: List[Tuple[str, str]]):
+    """Record item under key, only keeping full items once the key repeats
     
-    print(f"Found {len(items)} items")
-    return items
+    First sightings are held as the item's compact_item record and expanded
+    back into an item if the key turns out to be a duplicate.
+    """
+    if key in duplicates:
+        duplicates[key].append(item)
+    elif key in first_seen:
+        duplicates[key] = [expand_item(first_seen.pop(key), fields), item]
+    else:
+        first_seen[key] = record
 
-def analyze_accounts(items: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze accounts for duplicates and statistics"""
+def analyze_accounts(items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Analyze accounts for duplicates and statistics in a single pass"""
     analysis = {
-        'total': len(items),
+        'total': 0,
         'duplicate_account_ids': {},
         'duplicate_plaid_ids': {},
-        'by_user': defaultdict(int),
+        'by_user': Counter(),
         'active': 0,
         'inactive': 0
     }
     
-    account_id_map = defaultdict(list)
-    plaid_id_map = defaultdict(list)
+    # Compact first sighting of each key; it moves into the duplicate groups when repeated
+    first_by_account_id = {}
+    first_by_plaid_id = {}
     
     for item in items:
         account_id = item.get('accountId', {}).get('S')
@@ -82,11 +195,18 @@ def analyze_accounts(items: List[Dict[str, Any]]) -> Dict[str, Any]:
         user_id = item.get('userId', {}).get('S', 'N/A')
         active = item.get('active', {}).get('BOOL', True)
         
+        analysis['total'] += 1
+        
+        # One compact record per item, shared by both first-sighting maps
+        record = compact_item(item, ACCOUNT_FIELDS)
+        
         if account_id:
-            account_id_map[account_id].append(item)
+            track_duplicate(account_id, item, record, first_by_account_id,
+                            analysis['duplicate_account_ids'], ACCOUNT_FIELDS)
         
         if plaid_id:
-            plaid_id_map[plaid_id].append(item)
+            track_duplicate(plaid_id, item, record, first_by_plaid_id,
+                            analysis['duplicate_plaid_ids'], ACCOUNT_FIELDS)
         
         analysis['by_user'][user_id] += 1
         
@@ -95,53 +215,45 @@ def analyze_accounts(items: List[Dict[str, Any]]) -> Dict[str, Any]:
         else:
             analysis['inactive'] += 1
     
-    # Find duplicates
-    for acc_id, group in account_id_map.items():
-        if len(group) > 1:
-            analysis['duplicate_account_ids'][acc_id] = group
-    
-    for plaid_id, group in plaid_id_map.items():
-        if len(group) > 1:
-            analysis['duplicate_plaid_ids'][plaid_id] = group
-    
     return analysis
 
-def analyze_transactions(items: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze transactions for duplicates and statistics"""
+def iter_batches(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group an item stream into lists of at most size items"""
+    iterator = iter(items)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+def analyze_transactions(items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Analyze transactions for duplicates and statistics in a single pass"""
     analysis = {
-        'total': len(items),
+        'total': 0,
         'duplicate_transaction_ids': {},
         'duplicate_plaid_ids': {},
-        'by_user': defaultdict(int),
-        'by_account': defaultdict(int)
+        'by_user': Counter(),
+        'by_account': Counter()
     }
     
-    transaction_id_map = defaultdict(list)
-    plaid_id_map = defaultdict(list)
+    # Compact first sighting of each key; it moves into the duplicate groups when repeated
+    first_by_transaction_id = {}
+    first_by_plaid_id = {}
     
-    for item in items:
-        trans_id = item.get('transactionId', {}).get('S')
-        plaid_id = item.get('plaidTransactionId', {}).get('S')
-        user_id = item.get('userId', {}).get('S', 'N/A')
-        account_id = item.get('accountId', {}).get('S', 'N/A')
+    # Transactions is the large table, so tally per batch: Counter.update counts a list in C
+    for batch in iter_batches(items, ANALYSIS_BATCH_SIZE):
+        analysis['total'] += len(batch)
+        analysis['by_user'].update([item.get('userId', {}).get('S', 'N/A') for item in batch])
+        analysis['by_account'].update([item.get('accountId', {}).get('S', 'N/A') for item in batch])
         
-        if trans_id:
-            transaction_id_map[trans_id].append(item)
-        
-        if plaid_id:
-            plaid_id_map[plaid_id].append(item)
-        
-        analysis['by_user'][user_id] += 1
-        analysis['by_account'][account_id] += 1
-    
-    # Find duplicates
-    for trans_id, group in transaction_id_map.items():
-        if len(group) > 1:
-            analysis['duplicate_transaction_ids'][trans_id] = group
-    
-    for plaid_id, group in plaid_id_map.items():
-        if len(group) > 1:
-            analysis['duplicate_plaid_ids'][plaid_id] = group
+        for item in batch:
+            # One compact record per item, shared by both first-sighting maps
+            record = compact_item(item, TRANSACTION_FIELDS)
+            trans_id, plaid_id = record[0], record[1]  # TRANSACTION_FIELDS leads with both IDs
+            
+            if trans_id:
+                track_duplicate(trans_id, item, record, first_by_transaction_id,
+                                analysis['duplicate_transaction_ids'], TRANSACTION_FIELDS)
+            
+            if plaid_id:
+                track_duplicate(plaid_id, item, record, first_by_plaid_id,
+                                analysis['duplicate_plaid_ids'], TRANSACTION_FIELDS)
     
     return analysis
 
@@ -179,7 +291,7 @@ def print_account_analysis(analysis: Dict[str, Any]):
         print_success("No duplicate Plaid account IDs found")
     
     print(f"\nAccounts by User (top 10):")
-    for user_id, count in sorted(analysis['by_user'].items(), key=lambda x: x[1], reverse=True)[:10]:
+    for user_id, count in analysis['by_user'].most_common(10):
         print(f"  User {user_id}: {count} accounts")
 
 def print_transaction_analysis(analysis: Dict[str, Any]):
@@ -205,15 +317,54 @@ def print_transaction_analysis(analysis: Dict[str, Any]):
         print_success("No duplicate Plaid transaction IDs found")
     
     print(f"\nTransactions by User (top 10):")
-    for user_id, count in sorted(analysis['by_user'].items(), key=lambda x: x[1], reverse=True)[:10]:
+    for user_id, count in analysis['by_user'].most_common(10):
         print(f"  User {user_id}: {count} transactions")
 
+def write_bytes(path: str, payload: bytes):
+    """Write payload to path, copying large payloads straight into a memory map"""
+    if len(payload) < MMAP_WRITE_THRESHOLD:
+        with open(path, 'wb') as f:
+            f.write(payload)
+        return
+    
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.ftruncate(fd, len(payload))
+        with mmap.mmap(fd, len(payload)) as mm:
+            mm[:] = payload
+            mm.flush()
+    finally:
+        os.close(fd)
+
+def save_analysis(analysis: Dict[str, Any], output_dir: str, name: str):
+    """Save an analysis as a small summary JSON plus a JSON Lines file of duplicate groups
+    
+    Duplicate groups are streamed one per line so the full set is never
+    serialized in memory at once.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    duplicate_sections = [key for key in analysis if key.startswith('duplicate_')]
+    
+    summary = {key: value for key, value in analysis.items() if key not in duplicate_sections}
+    summary['duplicate_counts'] = {key: len(analysis[key]) for key in duplicate_sections}
+    write_bytes(f"{output_dir}/{name}-analysis.json", orjson.dumps(summary, option=ORJSON_OPTIONS, default=str))
+    
+    with open(f"{output_dir}/{name}-duplicates.jsonl", 'wb') as f:
+        for section in duplicate_sections:
+            for key, group in analysis[section].items():
+                f.write(orjson.dumps({'type': section, 'key': key, 'items': group}, default=str))
+                f.write(b'\n')
+
 def main():
     parser = argparse.ArgumentParser(description='Review BudgetBuddy DynamoDB tables')
     parser.add_argument('--region', default='us-east-1', help='AWS region')
     parser.add_argument('--table-prefix', default='BudgetBuddy', help='Table name prefix')
     parser.add_argument('--output-dir', default=None, help='Output directory for JSON files')
+    parser.add_argument('--scan-segments', type=int, default=4, help='Parallel scan segments per table')
+    parser.add_argument('--quiet', action='store_true', help='Skip DescribeTable item counts when checking tables')
     args = parser.parse_args()
+    if args.scan_segments < 1:
+        parser.error('--scan-segments must be at least 1')
     
     print_header("BudgetBuddy Database Review")
     print(f"Region: {args.region}")
@@ -222,7 +373,13 @@ def main():
     
     # Initialize DynamoDB client
     try:
-        dynamodb = boto3.client('dynamodb', region_name=args.region)
+        # Adaptive retries ride out throughput throttling instead of aborting a scan midway;
+        # the pool is sized for both tables' parallel scan segments
+        config = Config(
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            max_pool_connections=max(32, 2 * args.scan_segments)
+        )
+        dynamodb = boto3.client('dynamodb', region_name=args.region, config=config)
     except Exception as e:
         print_error(f"Failed to initialize DynamoDB client: {e}")
         sys.exit(1)
@@ -237,56 +394,90 @@ def main():
         f"{args.table_prefix}-AuditLogs"
     ]
     
-    # Check which tables exist
+    # Check which tables exist with a single (paginated) ListTables call
     print_header("Step 1: Checking Tables")
+    try:
+        all_tables = list_table_names(dynamodb)
+        candidate_tables = [table for table in tables if table in all_tables]
+    except Exception as e:
+        # e.g. no dynamodb:ListTables permission; check each table with DescribeTable instead
+        print_warning(f"Could not list tables ({e}); checking each table individually")
+        all_tables = None
+        candidate_tables = tables
+    
+    # DescribeTable supplies item counts, so quiet mode skips it unless it is the only
+    # existence check; the boto3 client is thread-safe, so the calls are issued together
+    descriptions = {}
+    if candidate_tables and (all_tables is None or not args.quiet):
+        with ThreadPoolExecutor(max_workers=len(candidate_tables)) as executor:
+            descriptions = {table: executor.submit(describe_table, dynamodb, table) for table in candidate_tables}
+    
     existing_tables = []
     for table in tables:
-        try:
-            response = dynamodb.describe_table(TableName=table)
-            item_count = response['Table'].get('ItemCount', 'N/A')
-            print_success(f"{table} exists (Item Count: {item_count})")
-            existing_tables.append(table)
-        except dynamodb.exceptions.ResourceNotFoundException:
+        if table not in candidate_tables:
             print_warning(f"{table} does not exist")
+            continue
+        
+        if table not in descriptions:
+            print_success(f"{table} exists")
+            existing_tables.append(table)
+            continue
+        
+        try:
+            description = descriptions[table].result()
         except Exception as e:
             print_error(f"Error checking {table}: {e}")
+            continue
+        
+        if description is None:
+            print_warning(f"{table} does not exist")
+        else:
+            item_count = description.get('ItemCount', 'N/A')
+            print_success(f"{table} exists (Item Count: {item_count})")
+            existing_tables.append(table)
     
     # Scan and analyze tables
     print_header("Step 2: Analyzing Tables")
     
+    accounts_table = f"{args.table_prefix}-Accounts"
+    transactions_table = f"{args.table_prefix}-Transactions"
+    
+    # Scan and analyze Accounts and Transactions in parallel, streaming items into the analyzers
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        analyses = {
+            table: executor.submit(analyze, iter_table(dynamodb, table, args.scan_segments, attributes))
+            for table, analyze, attributes in (
+                (accounts_table, analyze_accounts, ACCOUNT_ATTRIBUTES),
+                (transactions_table, analyze_transactions, TRANSACTION_ATTRIBUTES),
+            )
+            if table in existing_tables
+        }
+    
     # Analyze Accounts
-    if f"{args.table_prefix}-Accounts" in existing_tables:
+    if accounts_table in analyses:
         print_header("Accounts Analysis")
         try:
-            accounts = scan_table(dynamodb, f"{args.table_prefix}-Accounts")
-            if accounts:
-                analysis = analyze_accounts(accounts)
+            analysis = analyses[accounts_table].result()
+            if analysis['total']:
                 print_account_analysis(analysis)
                 
                 # Save to file if output directory specified
                 if args.output_dir:
-                    import os
-                    os.makedirs(args.output_dir, exist_ok=True)
-                    with open(f"{args.output_dir}/accounts-analysis.json", 'w') as f:
-                        json.dump(analysis, f, indent=2, default=str)
+                    save_analysis(analysis, args.output_dir, "accounts")
         except Exception as e:
             print_error(f"Error analyzing accounts: {e}")
     
     # Analyze Transactions
-    if f"{args.table_prefix}-Transactions" in existing_tables:
+    if transactions_table in analyses:
         print_header("Transactions Analysis")
         try:
-            transactions = scan_table(dynamodb, f"{args.table_prefix}-Transactions")
-            if transactions:
-                analysis = analyze_transactions(transactions)
+            analysis = analyses[transactions_table].result()
+            if analysis['total']:
                 print_transaction_analysis(analysis)
                 
                 # Save to file if output directory specified
                 if args.output_dir:
-                    import os
-                    os.makedirs(args.output_dir, exist_ok=True)
-                    with open(f"{args.output_dir}/transactions-analysis.json", 'w') as f:
-                        json.dump(analysis, f, indent=2, default=str)
+                    save_analysis(analysis, args.output_dir, "transactions")
         except Exception as e:
             print_error(f"Error analyzing transactions: {e}")
     